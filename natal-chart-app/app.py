@@ -4,16 +4,72 @@ Beautiful Gradio interface wrapping the natal chart skill
 """
 
 import gradio as gr
+from fastapi.middleware.gzip import GZipMiddleware
 from natal_backend import NatalChartGenerator, get_timezone_suggestions
+from starlette.middleware import Middleware
 from datetime import datetime
+from typing import Optional
+import asyncio
+import csv
+import itertools
 import json
+import os
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, stdlib json is the fallback
+    orjson = None
 
 
 # Initialize backend
 generator = NatalChartGenerator()
 
 
-def generate_natal_chart(
+class _PageGZipMiddleware(GZipMiddleware):
+    """GZip pages and assets, but leave the queue's event streams alone (gzip would buffer them)"""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and b"text/event-stream" in dict(scope["headers"]).get(b"accept", b""):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def server_app_kwargs() -> dict:
+    """
+    Extra settings for the FastAPI app Gradio creates (for launch() and
+    gr.mount_gradio_app deployments): compress the ~4KB+ landing page markup.
+    Returns a fresh dict per call, since Gradio mutates the one it's given.
+    """
+    return {
+        "middleware": [Middleware(_PageGZipMiddleware, minimum_size=500)]
+    }
+
+
+def _to_json(data) -> str:
+    """Pretty-print data as JSON, using orjson when it's installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _check_birth_ranges(
+    latitude: float,
+    longitude: float,
+    hour: int,
+    minute: int
+) -> Optional[str]:
+    """Return an error message for out-of-range birth data, or None if it's usable"""
+    if latitude is None or not -90 <= latitude <= 90:
+        return "Latitude must be between -90 and 90."
+    if longitude is None or not -180 <= longitude <= 180:
+        return "Longitude must be between -180 and 180."
+    if hour is None or minute is None or not 0 <= hour <= 23 or not 0 <= minute <= 59:
+        return "Birth time must be between 00:00 and 23:59."
+    return None
+
+
+async def generate_natal_chart(
     name: str,
     birth_date: str,  # YYYY-MM-DD format from Gradio date picker
     birth_hour: int,
@@ -21,104 +77,186 @@ def generate_natal_chart(
     city: str,
     latitude: float,
     longitude: float,
-    timezone: str
-) -> tuple:
+    timezone: str,
+    include_aspects: bool = True
+):
     """
     Main function called by Gradio interface
-    Returns: (interpretation_text, chart_image, detailed_json)
+    Streams: (interpretation_text, None, detailed_json) as soon as the chart is
+    calculated, then (interpretation_text, chart_svg_html, detailed_json) once it's drawn
     """
     
     # Validate inputs
     if not name or not birth_date:
-        return "❌ Please provide your name and birth date.", None, "Missing required fields"
+        yield "❌ Please provide your name and birth date.", None, "Missing required fields"
+        return
     
     try:
-        # Parse date
-        year, month, day = map(int, birth_date.split('-'))
-        
-        # Generate chart
-        result = generator.generate_chart(
-            name=name,
-            year=year,
-            month=month,
-            day=day,
-            hour=birth_hour,
-            minute=birth_minute,
-            latitude=latitude,
-            longitude=longitude,
-            timezone=timezone,
-            city=city
+        birth_dt = datetime.strptime(birth_date.strip(), "%Y-%m-%d")
+    except ValueError:
+        yield "❌ Invalid date — use YYYY-MM-DD (e.g. 1990-03-15).", None, "Invalid birth date"
+        return
+    
+    # Reject out-of-range values here instead of deep inside Kerykeion
+    range_error = _check_birth_ranges(latitude, longitude, birth_hour, birth_minute)
+    if range_error:
+        yield f"❌ {range_error}", None, range_error
+        return
+    
+    birth_kwargs = dict(
+        name=name,
+        year=birth_dt.year,
+        month=birth_dt.month,
+        day=birth_dt.day,
+        hour=birth_hour,
+        minute=birth_minute,
+        latitude=latitude,
+        longitude=longitude,
+        timezone=timezone
+    )
+    
+    try:
+        # Calculate the chart off the event loop (Swiss Ephemeris is CPU-bound)
+        result = await asyncio.to_thread(
+            generator.compute_chart,
+            city=city,
+            compute_aspects=include_aspects,
+            **birth_kwargs
         )
         
         if not result.get("success"):
             error_msg = result.get("error", "Unknown error")
-            return f"❌ Error: {error_msg}", None, json.dumps(result, indent=2)
+            yield f"❌ Error: {error_msg}", None, _to_json(result)
+            return
         
-        # Format interpretation for display
+        # Show the interpretation right away, the chart drawing is the slow part
         interpretation = format_interpretation(result)
-        
-        # Get chart SVG path
-        chart_path = result.get("chart_svg")
-        
-        # Format detailed data
         detailed_data = format_detailed_data(result)
+        yield interpretation, None, detailed_data
         
-        return interpretation, chart_path, detailed_data
+        try:
+            chart_svg = await asyncio.to_thread(generator.render_svg, **birth_kwargs)
+        except Exception as e:
+            yield f"{interpretation}\n\n⚠️ Chart image could not be drawn: {e}", None, detailed_data
+            return
+        
+        yield interpretation, f'<div class="natal-chart">{chart_svg}</div>', detailed_data
         
     except Exception as e:
-        return f"❌ Error: {str(e)}", None, str(e)
+        yield f"❌ Error: {str(e)}", None, str(e)
 
 
-def format_interpretation(result: dict) -> str:
-    """Format the interpretation text for beautiful display"""
+# Upper bound on CSV rows per Batch Mode upload (one upload holds one queue slot)
+MAX_BATCH_ROWS = 100
+
+
+def _parse_batch_row(row: dict) -> dict:
+    """Convert one CSV row into generate_chart keyword arguments"""
+    birth_dt = datetime.strptime(row["date"].strip(), "%Y-%m-%d")
+    parsed = {
+        "name": row["name"].strip(),
+        "year": birth_dt.year,
+        "month": birth_dt.month,
+        "day": birth_dt.day,
+        "hour": int(row["hour"]),
+        "minute": int(row["minute"]),
+        "latitude": float(row["latitude"]),
+        "longitude": float(row["longitude"]),
+        "timezone": row["timezone"].strip(),
+        "city": (row.get("city") or "").strip() or None
+    }
     
-    interp = result["interpretation"]
-    placements = result["placements"]
+    range_error = _check_birth_ranges(
+        parsed["latitude"], parsed["longitude"], parsed["hour"], parsed["minute"]
+    )
+    if range_error:
+        raise ValueError(f"{parsed['name']}: {range_error}")
     
-    # Build beautiful text output
-    text = f"""
-# 🌟 Natal Chart for {result['name']}
+    return parsed
+
+
+async def generate_batch(csv_path: str) -> str:
+    """
+    Batch Mode handler: chart data (no SVG) for each CSV row
+    Returns: JSON list of results, in row order
+    """
+    if not csv_path:
+        return "❌ Please upload a CSV file."
+    
+    try:
+        with open(csv_path, newline="", encoding="utf-8-sig") as f:
+            rows = list(itertools.islice(csv.DictReader(f), MAX_BATCH_ROWS + 1))
+        if len(rows) > MAX_BATCH_ROWS:
+            return _to_json({"success": False, "error": f"Too many rows: Batch Mode handles up to {MAX_BATCH_ROWS} charts per upload"})
+        batch = [_parse_batch_row(row) for row in rows]
+    except (KeyError, ValueError, TypeError, AttributeError, csv.Error) as e:
+        return _to_json({"success": False, "error": f"Invalid CSV: {e}"})
+    
+    # Chart data only: drawing an SVG per row is slow and the files can't be downloaded here
+    results = await asyncio.to_thread(generator.generate_charts, batch, save_svgs=False)
+    return _to_json(results)
+
+
+# Markdown header of the interpretation, filled in per chart
+_HEADER_TEMPLATE = """
+# 🌟 Natal Chart for {name}
 
 ## Birth Information
-📅 **Date**: {result['birth_data']['date']}  
-🕐 **Time**: {result['birth_data']['time']}  
-📍 **Location**: {result['birth_data']['location']}  
-🌍 **Timezone**: {result['birth_data']['timezone']}
+📅 **Date**: {date}  
+🕐 **Time**: {time}  
+📍 **Location**: {location}  
+🌍 **Timezone**: {timezone}
 
 ---
 
 ## ✨ Your Core Identity (Big Three)
 
-{interp['sun']}
+{sun}
 
-{interp['moon']}
+{moon}
 
-{interp['rising']}
+{rising}
 
 ---
 
 ## 🪐 Planetary Placements
 
 """
+
+
+def format_interpretation(result: dict) -> str:
+    """Format the interpretation text for beautiful display"""
+    
+    interp = result["interpretation"]
+    placements = result["placements"]
+    
+    # Build beautiful text output
+    parts = [_HEADER_TEMPLATE.format(
+        name=result['name'],
+        **result['birth_data'],
+        **interp
+    )]
     
     # Add planet placements
     for planet, data in placements.items():
         retrograde = " ℞" if data['retrograde'] else ""
-        text += f"**{planet}**: {data['sign']} at {data['position']}° (House {data['house']}){retrograde}\n\n"
+        parts.append(f"**{planet}**: {data['sign']} at {data['position']}° (House {data['house']}){retrograde}\n\n")
     
     # Add aspects if available
     aspects = result.get("aspects", [])
     if aspects:
-        text += "\n---\n\n## 🔗 Major Aspects\n\n"
-        for aspect in aspects[:5]:  # Top 5
-            text += f"- {aspect['planets']}: {aspect['type']} (orb {aspect['orb']}°)\n"
+        parts.append("\n---\n\n## 🔗 Major Aspects\n\n")
+        parts.extend(
+            f"- {aspect['planets']}: {aspect['type']} (orb {aspect['orb']}°)\n"
+            for aspect in aspects[:5]  # Top 5
+        )
     
-    return text
+    return "".join(parts)
 
 
 def format_detailed_data(result: dict) -> str:
     """Format detailed JSON data for the accordion"""
-    return json.dumps(result, indent=2)
+    return _to_json(result)
 
 
 # Common city coordinates helper
@@ -140,13 +278,17 @@ COMMON_CITIES = {
     "São Paulo, Brazil": (-23.5505, -46.6333, "America/Sao_Paulo"),
 }
 
+_CITY_NAMES = tuple(COMMON_CITIES.keys())
+_CITY_CHOICES = ("Custom Location",) + _CITY_NAMES
+
 
 def fill_city_coords(city_selection):
     """Auto-fill coordinates when user selects a city"""
-    if city_selection in COMMON_CITIES:
-        lat, lng, tz = COMMON_CITIES[city_selection]
-        return lat, lng, tz, city_selection
-    return 0.0, 0.0, "UTC", ""
+    coords = COMMON_CITIES.get(city_selection)
+    if coords is None:
+        return 0.0, 0.0, "UTC", ""
+    lat, lng, tz = coords
+    return lat, lng, tz, city_selection
 
 
 # Build Gradio Interface
@@ -167,119 +309,153 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Natal Chart Generator") as app:
     ---
     """)
     
-    with gr.Row():
-        with gr.Column(scale=1):
-            gr.Markdown("### 📝 Your Birth Information")
-            
-            name_input = gr.Textbox(
-                label="Full Name",
-                placeholder="Jane Doe",
-                info="Your name for the chart"
-            )
-            
-            birth_date_input = gr.Textbox(
-                label="Birth Date",
-                placeholder="1990-03-15",
-                info="Format: YYYY-MM-DD"
-            )
-            
-            with gr.Row():
-                birth_hour = gr.Slider(
-                    minimum=0,
-                    maximum=23,
-                    value=12,
-                    step=1,
-                    label="Birth Hour (24h format)"
+    with gr.Tab("Single Chart"):
+        with gr.Row():
+            with gr.Column(scale=1):
+                gr.Markdown("### 📝 Your Birth Information")
+                
+                name_input = gr.Textbox(
+                    label="Full Name",
+                    placeholder="Jane Doe",
+                    info="Your name for the chart"
                 )
-                birth_minute = gr.Slider(
-                    minimum=0,
-                    maximum=59,
-                    value=0,
-                    step=1,
-                    label="Birth Minute"
+                
+                birth_date_input = gr.Textbox(
+                    label="Birth Date",
+                    placeholder="1990-03-15",
+                    info="Format: YYYY-MM-DD"
                 )
+                
+                with gr.Row():
+                    birth_hour = gr.Slider(
+                        minimum=0,
+                        maximum=23,
+                        value=12,
+                        step=1,
+                        label="Birth Hour (24h format)"
+                    )
+                    birth_minute = gr.Slider(
+                        minimum=0,
+                        maximum=59,
+                        value=0,
+                        step=1,
+                        label="Birth Minute"
+                    )
+                
+                gr.Markdown("### 📍 Birth Location")
+                
+                city_dropdown = gr.Dropdown(
+                    choices=_CITY_CHOICES,
+                    label="Select City (or choose Custom)",
+                    value="Custom Location",
+                    info="Quick select for common cities"
+                )
+                
+                city_input = gr.Textbox(
+                    label="City Name (optional)",
+                    placeholder="New York",
+                    info="For display purposes"
+                )
+                
+                latitude = gr.Number(
+                    label="Latitude",
+                    value=40.7128,
+                    info="North is positive, South is negative"
+                )
+                
+                longitude = gr.Number(
+                    label="Longitude",
+                    value=-74.0060,
+                    info="East is positive, West is negative"
+                )
+                
+                timezone = gr.Dropdown(
+                    choices=get_timezone_suggestions(),
+                    label="Timezone",
+                    value="America/New_York",
+                    info="Select your birth location timezone"
+                )
+                
+                # Auto-fill coordinates when city selected
+                city_dropdown.change(
+                    fn=fill_city_coords,
+                    inputs=[city_dropdown],
+                    outputs=[latitude, longitude, timezone, city_input]
+                )
+                
+                include_aspects = gr.Checkbox(
+                    label="Include aspects (slower)",
+                    value=True,
+                    info="Untick for a quicker chart without the aspect list"
+                )
+                
+                generate_btn = gr.Button("✨ Generate My Chart", variant="primary", size="lg")
             
-            gr.Markdown("### 📍 Birth Location")
-            
-            city_dropdown = gr.Dropdown(
-                choices=["Custom Location"] + list(COMMON_CITIES.keys()),
-                label="Select City (or choose Custom)",
-                value="Custom Location",
-                info="Quick select for common cities"
-            )
-            
-            city_input = gr.Textbox(
-                label="City Name (optional)",
-                placeholder="New York",
-                info="For display purposes"
-            )
-            
-            latitude = gr.Number(
-                label="Latitude",
-                value=40.7128,
-                info="North is positive, South is negative"
-            )
-            
-            longitude = gr.Number(
-                label="Longitude",
-                value=-74.0060,
-                info="East is positive, West is negative"
-            )
-            
-            timezone = gr.Dropdown(
-                choices=get_timezone_suggestions(),
-                label="Timezone",
-                value="America/New_York",
-                info="Select your birth location timezone"
-            )
-            
-            # Auto-fill coordinates when city selected
-            city_dropdown.change(
-                fn=fill_city_coords,
-                inputs=[city_dropdown],
-                outputs=[latitude, longitude, timezone, city_input]
-            )
-            
-            generate_btn = gr.Button("✨ Generate My Chart", variant="primary", size="lg")
-        
-        with gr.Column(scale=2):
-            gr.Markdown("### 🌟 Your Natal Chart")
-            
-            interpretation_output = gr.Markdown(
-                value="Your chart interpretation will appear here...",
-                label="Interpretation"
-            )
-            
-            chart_output = gr.Image(
-                label="Birth Chart Visualization",
-                type="filepath"
-            )
-            
-            with gr.Accordion("📊 Detailed Data (JSON)", open=False):
-                detailed_output = gr.Code(
-                    label="Complete Chart Data",
-                    language="json"
+            with gr.Column(scale=2):
+                gr.Markdown("### 🌟 Your Natal Chart")
+                
+                interpretation_output = gr.Markdown(
+                    value="Your chart interpretation will appear here...",
+                    label="Interpretation"
+                )
+                
+                chart_output = gr.HTML(
+                    label="Birth Chart Visualization"
                 )
+                
+                with gr.Accordion("📊 Detailed Data (JSON)", open=False):
+                    detailed_output = gr.Code(
+                        label="Complete Chart Data",
+                        language="json"
+                    )
+        
+        # Wire up the generate button
+        generate_btn.click(
+            fn=generate_natal_chart,
+            inputs=[
+                name_input,
+                birth_date_input,
+                birth_hour,
+                birth_minute,
+                city_input,
+                latitude,
+                longitude,
+                timezone,
+                include_aspects
+            ],
+            outputs=[
+                interpretation_output,
+                chart_output,
+                detailed_output
+            ]
+        )
     
-    # Wire up the generate button
-    generate_btn.click(
-        fn=generate_natal_chart,
-        inputs=[
-            name_input,
-            birth_date_input,
-            birth_hour,
-            birth_minute,
-            city_input,
-            latitude,
-            longitude,
-            timezone
-        ],
-        outputs=[
-            interpretation_output,
-            chart_output,
-            detailed_output
-        ]
-    )
+    with gr.Tab("Batch Mode"):
+        gr.Markdown(f"""
+        ### 📂 Generate Many Charts at Once
+        
+        Upload a CSV with the columns `name, date, hour, minute, latitude, longitude, timezone`
+        (and optionally `city`). Dates use the YYYY-MM-DD format. Up to {MAX_BATCH_ROWS} rows per upload.
+        """)
+        
+        batch_file = gr.File(
+            label="Birth Data CSV",
+            file_types=[".csv"],
+            type="filepath"
+        )
+        
+        batch_btn = gr.Button("✨ Generate All Charts", variant="primary")
+        
+        batch_output = gr.Code(
+            label="Batch Results",
+            language="json"
+        )
+        
+        batch_btn.click(
+            fn=generate_batch,
+            inputs=[batch_file],
+            outputs=[batch_output]
+        )
     
     gr.Markdown("""
     ---
@@ -298,11 +474,21 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Natal Chart Generator") as app:
     """)
 
 
+# Run up to one chart per core at a time (the handlers do the heavy work in
+# threads) and cap the waiting line so overload fails fast instead of piling up.
+# Configured at import so ASGI deployments that mount `app` get it too.
+app.queue(
+    default_concurrency_limit=max(2, os.cpu_count() or 1),
+    max_size=64
+)
+
+
 # Launch the app
 if __name__ == "__main__":
     app.launch(
         server_name="0.0.0.0",  # Allow external access
         server_port=7860,
         share=False,  # Set to True for public Gradio link
-        show_error=True
+        show_error=True,
+        app_kwargs=server_app_kwargs()
     )
@@ -0,0 +1,47 @@
+"""
+Test setup for the natal chart app
+The helpers under test are pure Python, so minimal stand-ins are registered
+for Kerykeion / Gradio / FastAPI when they aren't installed.
+"""
+
+import os
+import sys
+import types
+from unittest import mock
+
+# Don't start the background Swiss Ephemeris warmup during tests
+os.environ["NATAL_WARMUP"] = "0"
+
+
+def _register(name: str, **attrs) -> None:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules.setdefault(name, module)
+
+
+try:
+    import kerykeion  # noqa: F401
+except ImportError:
+    _register("kerykeion", AstrologicalSubject=object, KerykeionChartSVG=object, NatalAspects=object)
+
+try:
+    import gradio  # noqa: F401
+except ImportError:
+    sys.modules["gradio"] = mock.MagicMock()
+
+try:
+    from fastapi.middleware.gzip import GZipMiddleware  # noqa: F401
+except ImportError:
+    class _GZipMiddleware:
+        def __init__(self, app, minimum_size: int = 500, compresslevel: int = 9):
+            self.app = app
+
+    _register("fastapi")
+    _register("fastapi.middleware")
+    _register("fastapi.middleware.gzip", GZipMiddleware=_GZipMiddleware)
+
+try:
+    from starlette.middleware import Middleware  # noqa: F401
+except ImportError:
+    _register("starlette")
+    _register("starlette.middleware", Middleware=lambda cls, **options: (cls, options))
@@ -4,19 +4,255 @@ Wraps the Kerykeion skill with clean API for the Gradio frontend
 """
 
 from kerykeion import AstrologicalSubject, KerykeionChartSVG, NatalAspects
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
+import copy
+import hashlib
+import html
 import json
+import logging
+import operator
+import os
+import threading
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Optional: JIT only pays off for large (batch) aspect lists
+    njit = None
+
+
+# Saved chart SVGs (generate_chart)
+_OUTPUT_DIR = Path("output").resolve()
+# Created on the first save, so importing this module never touches the disk
+_output_dir_ready = False
+
+# Coordinates are rounded to 3 decimals (~100m) before hitting the cache,
+# which is far below what matters for a natal chart
+_COORD_PRECISION = 3
+
+_PLANET_NAMES = (
+    "Sun", "Moon", "Mercury", "Venus", "Mars",
+    "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"
+)
+_PLANET_GETTER = operator.attrgetter(*(name.lower() for name in _PLANET_NAMES))
+
+_HOUSE_ATTRS = (
+    "first_house", "second_house", "third_house", "fourth_house",
+    "fifth_house", "sixth_house", "seventh_house", "eighth_house",
+    "ninth_house", "tenth_house", "eleventh_house", "twelfth_house"
+)
+_HOUSE_GETTER = operator.attrgetter(*_HOUSE_ATTRS)
+
+# Number of aspects kept per chart, tightest orb first
+_TOP_ASPECTS = 10
+
+
+def _top_aspects(orbits: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the n tightest orbs, tightest first"""
+    abs_orbits = np.abs(orbits)
+    if abs_orbits.size > n:
+        idx = np.argpartition(abs_orbits, n - 1)[:n]
+    else:
+        idx = np.arange(abs_orbits.size)
+    return idx[np.argsort(abs_orbits[idx], kind="mergesort")]
+
+
+if njit is not None:
+    _top_aspects = njit(cache=True)(_top_aspects)
+
+
+@lru_cache(maxsize=512)
+def _build_subject(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    lat: float,
+    lng: float,
+    timezone: str
+) -> AstrologicalSubject:
+    """Run the Swiss Ephemeris calculation once per unique birth moment/place"""
+    return AstrologicalSubject(
+        name="Natal Chart",
+        year=year,
+        month=month,
+        day=day,
+        hour=hour,
+        minute=minute,
+        lat=lat,
+        lng=lng,
+        tz_str=timezone
+    )
+
+
+@lru_cache(maxsize=512)
+def _build_aspects(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    lat: float,
+    lng: float,
+    timezone: str
+) -> NatalAspects:
+    """Aspects for the cached subject (name doesn't affect them)"""
+    return NatalAspects(_build_subject(year, month, day, hour, minute, lat, lng, timezone))
+
+
+def _subject_key(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    latitude: float,
+    longitude: float,
+    timezone: str
+) -> Tuple:
+    """Cache key for the subject/aspects caches"""
+    return (
+        year, month, day, hour, minute,
+        round(latitude, _COORD_PRECISION),
+        round(longitude, _COORD_PRECISION),
+        timezone
+    )
+
+
+def _named_subject(name: str, key: Tuple) -> AstrologicalSubject:
+    """Cached subject labelled with name (only the chart drawing uses it, so a shallow copy is enough)"""
+    subject = copy.copy(_build_subject(*key))
+    subject.name = name
+    return subject
+
+
+@lru_cache(maxsize=128)
+def _render_chart_svg(
+    name: str,
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    lat: float,
+    lng: float,
+    timezone: str
+) -> str:
+    """SVG markup of the chart wheel, kept in memory (a chart is ~100-200 KB)"""
+    key = (year, month, day, hour, minute, lat, lng, timezone)
+    # Kerykeion drops the name into the markup as-is, and the UI embeds it inline
+    return KerykeionChartSVG(_named_subject(html.escape(name), key)).makeTemplate()
+
+
+def _chart_hash(
+    name: str,
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    lat: float,
+    lng: float,
+    timezone: str
+) -> str:
+    """Stable file key for a rendered chart (the name is drawn on the SVG)"""
+    raw = f"{name}|{year}-{month}-{day} {hour}:{minute}|{lat:.4f},{lng:.4f}|{timezone}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+_TIMEZONE_SUGGESTIONS = (
+    "America/New_York",
+    "America/Chicago",
+    "America/Denver",
+    "America/Los_Angeles",
+    "America/Phoenix",
+    "America/Anchorage",
+    "Pacific/Honolulu",
+    "Europe/London",
+    "Europe/Paris",
+    "Europe/Berlin",
+    "Europe/Rome",
+    "Europe/Madrid",
+    "Europe/Lisbon",
+    "Asia/Tokyo",
+    "Asia/Shanghai",
+    "Asia/Hong_Kong",
+    "Asia/Singapore",
+    "Asia/Dubai",
+    "Asia/Kolkata",
+    "Australia/Sydney",
+    "Australia/Melbourne",
+    "Pacific/Auckland"
+)
+
+
+# Plain-language sign meanings, built once at import and read-only
+_SUN_INTERP = MappingProxyType({
+    "Aries": "Bold, energetic, and pioneering. You lead with courage and initiative.",
+    "Taurus": "Grounded, reliable, and sensual. You value stability and comfort.",
+    "Gemini": "Curious, adaptable, and communicative. You thrive on variety and mental stimulation.",
+    "Cancer": "Nurturing, intuitive, and protective. You lead with emotion and care deeply.",
+    "Leo": "Confident, creative, and charismatic. You shine brightest when expressing yourself.",
+    "Virgo": "Analytical, practical, and helpful. You excel at refining and improving.",
+    "Libra": "Diplomatic, harmonious, and fair. You seek balance and beauty in all things.",
+    "Scorpio": "Intense, passionate, and transformative. You dive deep into life's mysteries.",
+    "Sagittarius": "Adventurous, optimistic, and philosophical. You seek meaning and expansion.",
+    "Capricorn": "Ambitious, disciplined, and responsible. You build lasting structures.",
+    "Aquarius": "Innovative, independent, and humanitarian. You envision the future.",
+    "Pisces": "Compassionate, imaginative, and spiritual. You feel deeply and dream big."
+})
+
+_MOON_INTERP = MappingProxyType({
+    "Aries": "Your emotions are direct and passionate. You need independence.",
+    "Taurus": "You seek emotional security through comfort and stability.",
+    "Gemini": "You process emotions intellectually and need variety.",
+    "Cancer": "Deeply emotional and nurturing. Home is your sanctuary.",
+    "Leo": "You need recognition and warmth in your emotional life.",
+    "Virgo": "You feel secure when things are organized and useful.",
+    "Libra": "Emotional balance comes through partnership and harmony.",
+    "Scorpio": "Your emotions run deep and intense. You crave intimacy.",
+    "Sagittarius": "Emotional freedom and adventure feed your soul.",
+    "Capricorn": "You find security through achievement and structure.",
+    "Aquarius": "You need emotional space and intellectual connection.",
+    "Pisces": "Ultra-sensitive and empathic. You absorb others' feelings."
+})
+
+_RISING_INTERP = MappingProxyType({
+    "Aries": "You come across as bold, direct, and energetic.",
+    "Taurus": "You appear calm, steady, and approachable.",
+    "Gemini": "You seem curious, talkative, and youthful.",
+    "Cancer": "You give off a caring, protective vibe.",
+    "Leo": "You have a warm, confident, magnetic presence.",
+    "Virgo": "You appear helpful, modest, and detail-oriented.",
+    "Libra": "You come across as charming, diplomatic, and refined.",
+    "Scorpio": "You have an intense, mysterious, magnetic aura.",
+    "Sagittarius": "You seem optimistic, adventurous, and frank.",
+    "Capricorn": "You appear serious, responsible, and composed.",
+    "Aquarius": "You seem unique, friendly, and unconventional.",
+    "Pisces": "You give off a gentle, dreamy, compassionate vibe."
+})
+
+
+@lru_cache(maxsize=2048)
+def _interp_triplet(sun_sign: str, moon_sign: str, rising_sign: str) -> Dict[str, str]:
+    """Big Three interpretation text; shared between charts, so treat as read-only"""
+    return {
+        "sun": f"☉ **Sun in {sun_sign}**: {_SUN_INTERP.get(sun_sign, 'Your core identity.')}",
+        "moon": f"☽ **Moon in {moon_sign}**: {_MOON_INTERP.get(moon_sign, 'Your emotional nature.')}",
+        "rising": f"↑ **Rising {rising_sign}**: {_RISING_INTERP.get(rising_sign, 'How others see you.')}"
+    }
 
 
 class NatalChartGenerator:
     """Clean API wrapper for natal chart generation"""
     
-    def __init__(self):
-        self.output_dir = Path("output")
-        self.output_dir.mkdir(exist_ok=True)
-    
     def generate_chart(
         self,
         name: str,
@@ -28,35 +264,64 @@ class NatalChartGenerator:
         latitude: float,
         longitude: float,
         timezone: str,
-        city: Optional[str] = None
+        city: Optional[str] = None,
+        compute_aspects: bool = True
     ) -> Dict:
         """
         Generate complete natal chart with interpretations
         
+        Set compute_aspects=False to skip the aspect calculation ("aspects" is then empty).
+        
         Returns:
             Dict with keys: subject_data, chart_svg_path, interpretation, aspects
         """
+        chart_data = self.compute_chart(
+            name, year, month, day, hour, minute, latitude, longitude, timezone, city,
+            compute_aspects=compute_aspects
+        )
+        if not chart_data["success"]:
+            return chart_data
+        
         try:
-            # Create astrological subject
-            subject = AstrologicalSubject(
-                name=name,
-                year=year,
-                month=month,
-                day=day,
-                hour=hour,
-                minute=minute,
-                lat=latitude,
-                lng=longitude,
-                tz_str=timezone
+            chart_data["chart_svg"] = self.save_svg(
+                name, year, month, day, hour, minute, latitude, longitude, timezone
             )
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "Failed to generate natal chart. Please check your input data."
+            }
+        
+        return chart_data
+    
+    def compute_chart(
+        self,
+        name: str,
+        year: int,
+        month: int,
+        day: int,
+        hour: int,
+        minute: int,
+        latitude: float,
+        longitude: float,
+        timezone: str,
+        city: Optional[str] = None,
+        compute_aspects: bool = True
+    ) -> Dict:
+        """
+        Calculate placements, aspects and interpretations without drawing the chart
+        
+        Returns:
+            Same dict as generate_chart, with chart_svg set to None
+        """
+        try:
+            # Create astrological subject (cached heavy calculation)
+            key = _subject_key(year, month, day, hour, minute, latitude, longitude, timezone)
+            subject = _build_subject(*key)
             
-            # Generate SVG chart
-            chart = KerykeionChartSVG(subject)
-            svg_path = self.output_dir / f"{name.replace(' ', '_')}_chart.svg"
-            chart.makeSVG()
-            
-            # Get aspects
-            aspects = NatalAspects(subject)
+            # Get aspects (skipped in quick mode)
+            aspects = self._get_aspects(_build_aspects(*key)) if compute_aspects else []
             
             # Extract key data
             chart_data = {
@@ -70,8 +335,8 @@ class NatalChartGenerator:
                 },
                 "placements": self._get_placements(subject),
                 "houses": self._get_houses(subject),
-                "aspects": self._get_aspects(aspects),
-                "chart_svg": str(svg_path),
+                "aspects": aspects,
+                "chart_svg": None,
                 "interpretation": self._generate_interpretation(subject)
             }
             
@@ -84,54 +349,120 @@ class NatalChartGenerator:
                 "message": "Failed to generate natal chart. Please check your input data."
             }
     
+    def render_svg(
+        self,
+        name: str,
+        year: int,
+        month: int,
+        day: int,
+        hour: int,
+        minute: int,
+        latitude: float,
+        longitude: float,
+        timezone: str
+    ) -> str:
+        """
+        Draw the chart wheel (the slow part) and return the SVG markup
+        
+        Nothing touches the disk; repeat charts come from an in-memory cache.
+        Raises whatever Kerykeion raises.
+        """
+        key = _subject_key(year, month, day, hour, minute, latitude, longitude, timezone)
+        return _render_chart_svg(name, *key)
+    
+    def save_svg(
+        self,
+        name: str,
+        year: int,
+        month: int,
+        day: int,
+        hour: int,
+        minute: int,
+        latitude: float,
+        longitude: float,
+        timezone: str
+    ) -> str:
+        """
+        Write the chart SVG under output/ and return the file path
+        
+        Raises whatever Kerykeion raises; generate_chart turns that into an error dict.
+        """
+        global _output_dir_ready
+        if not _output_dir_ready:
+            _OUTPUT_DIR.mkdir(exist_ok=True)
+            _output_dir_ready = True
+        
+        key = _subject_key(year, month, day, hour, minute, latitude, longitude, timezone)
+        
+        # Reuse the file if this exact chart was drawn before
+        svg_path = _OUTPUT_DIR / f"{_chart_hash(name, *key)}.svg"
+        if svg_path.exists():
+            os.utime(svg_path)  # Keep mtime fresh for LRU-style cleanup
+        else:
+            # Write to a temp file first so concurrent requests never see a partial SVG
+            tmp_path = svg_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+            tmp_path.write_text(_render_chart_svg(name, *key), encoding="utf-8")
+            os.replace(tmp_path, svg_path)
+        
+        return str(svg_path)
+    
+    def generate_charts(self, batch: List[Dict], save_svgs: bool = True) -> List[Dict]:
+        """
+        Generate several natal charts concurrently
+        
+        Args:
+            batch: List of generate_chart keyword-argument dicts
+            save_svgs: Write each chart's SVG under output/ (generate_chart); when
+                False only the data is calculated (compute_chart), which is much faster
+        
+        Returns:
+            List of results, in the same order as batch
+        """
+        build = self.generate_chart if save_svgs else self.compute_chart
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(lambda request: build(**request), batch))
+    
     def _get_placements(self, subject: AstrologicalSubject) -> Dict[str, Dict]:
         """Extract planetary placements"""
-        planets = {
-            "Sun": subject.sun,
-            "Moon": subject.moon,
-            "Mercury": subject.mercury,
-            "Venus": subject.venus,
-            "Mars": subject.mars,
-            "Jupiter": subject.jupiter,
-            "Saturn": subject.saturn,
-            "Uranus": subject.uranus,
-            "Neptune": subject.neptune,
-            "Pluto": subject.pluto
-        }
-        
-        placements = {}
-        for name, planet in planets.items():
-            placements[name] = {
+        return {
+            name: {
                 "sign": planet.sign,
                 "position": round(planet.position, 2),
                 "house": planet.house,
                 "retrograde": planet.retrograde
             }
-        
-        return placements
+            for name, planet in zip(_PLANET_NAMES, _PLANET_GETTER(subject))
+        }
     
     def _get_houses(self, subject: AstrologicalSubject) -> Dict[str, str]:
         """Extract house cusps"""
-        houses = {}
-        for i in range(1, 13):
-            house = getattr(subject, f"{'first' if i == 1 else 'second' if i == 2 else 'third' if i == 3 else ['fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth', 'tenth', 'eleventh', 'twelfth'][i-4]}_house")
-            houses[f"House {i}"] = house.sign
-        
-        return houses
+        return {
+            f"House {i}": house.sign
+            for i, house in zip(range(1, 13), _HOUSE_GETTER(subject))
+        }
     
     def _get_aspects(self, aspects: NatalAspects) -> List[Dict]:
-        """Extract major aspects"""
-        aspect_list = []
+        """Extract major aspects (tightest orbs first)"""
+        if not hasattr(aspects, 'all_aspects'):
+            return []
+        
+        all_aspects = aspects.all_aspects
+        orbits = np.fromiter(
+            (aspect['orbit'] for aspect in all_aspects),
+            dtype=np.float64,
+            count=len(all_aspects)
+        )
         
-        if hasattr(aspects, 'all_aspects'):
-            for aspect in aspects.all_aspects:
-                aspect_list.append({
-                    "planets": f"{aspect['p1_name']} - {aspect['p2_name']}",
-                    "type": aspect['aspect'],
-                    "orb": round(aspect['orbit'], 2)
-                })
+        aspect_list = []
+        for i in _top_aspects(orbits, _TOP_ASPECTS):
+            aspect = all_aspects[i]
+            aspect_list.append({
+                "planets": f"{aspect['p1_name']} - {aspect['p2_name']}",
+                "type": aspect['aspect'],
+                "orb": round(aspect['orbit'], 2)
+            })
         
-        return aspect_list[:10]  # Top 10 aspects
+        return aspect_list
     
     def _generate_interpretation(self, subject: AstrologicalSubject) -> Dict[str, str]:
         """
@@ -139,91 +470,32 @@ class NatalChartGenerator:
         Using basic astrology meanings
         """
         
-        # Sun sign interpretation
-        sun_sign = subject.sun.sign
-        sun_interpretations = {
-            "Aries": "Bold, energetic, and pioneering. You lead with courage and initiative.",
-            "Taurus": "Grounded, reliable, and sensual. You value stability and comfort.",
-            "Gemini": "Curious, adaptable, and communicative. You thrive on variety and mental stimulation.",
-            "Cancer": "Nurturing, intuitive, and protective. You lead with emotion and care deeply.",
-            "Leo": "Confident, creative, and charismatic. You shine brightest when expressing yourself.",
-            "Virgo": "Analytical, practical, and helpful. You excel at refining and improving.",
-            "Libra": "Diplomatic, harmonious, and fair. You seek balance and beauty in all things.",
-            "Scorpio": "Intense, passionate, and transformative. You dive deep into life's mysteries.",
-            "Sagittarius": "Adventurous, optimistic, and philosophical. You seek meaning and expansion.",
-            "Capricorn": "Ambitious, disciplined, and responsible. You build lasting structures.",
-            "Aquarius": "Innovative, independent, and humanitarian. You envision the future.",
-            "Pisces": "Compassionate, imaginative, and spiritual. You feel deeply and dream big."
-        }
-        
-        # Moon sign interpretation
-        moon_sign = subject.moon.sign
-        moon_interpretations = {
-            "Aries": "Your emotions are direct and passionate. You need independence.",
-            "Taurus": "You seek emotional security through comfort and stability.",
-            "Gemini": "You process emotions intellectually and need variety.",
-            "Cancer": "Deeply emotional and nurturing. Home is your sanctuary.",
-            "Leo": "You need recognition and warmth in your emotional life.",
-            "Virgo": "You feel secure when things are organized and useful.",
-            "Libra": "Emotional balance comes through partnership and harmony.",
-            "Scorpio": "Your emotions run deep and intense. You crave intimacy.",
-            "Sagittarius": "Emotional freedom and adventure feed your soul.",
-            "Capricorn": "You find security through achievement and structure.",
-            "Aquarius": "You need emotional space and intellectual connection.",
-            "Pisces": "Ultra-sensitive and empathic. You absorb others' feelings."
-        }
-        
-        # Rising sign interpretation
-        rising_sign = subject.first_house.sign
-        rising_interpretations = {
-            "Aries": "You come across as bold, direct, and energetic.",
-            "Taurus": "You appear calm, steady, and approachable.",
-            "Gemini": "You seem curious, talkative, and youthful.",
-            "Cancer": "You give off a caring, protective vibe.",
-            "Leo": "You have a warm, confident, magnetic presence.",
-            "Virgo": "You appear helpful, modest, and detail-oriented.",
-            "Libra": "You come across as charming, diplomatic, and refined.",
-            "Scorpio": "You have an intense, mysterious, magnetic aura.",
-            "Sagittarius": "You seem optimistic, adventurous, and frank.",
-            "Capricorn": "You appear serious, responsible, and composed.",
-            "Aquarius": "You seem unique, friendly, and unconventional.",
-            "Pisces": "You give off a gentle, dreamy, compassionate vibe."
-        }
-        
-        return {
-            "sun": f"☉ **Sun in {sun_sign}**: {sun_interpretations.get(sun_sign, 'Your core identity.')}",
-            "moon": f"☽ **Moon in {moon_sign}**: {moon_interpretations.get(moon_sign, 'Your emotional nature.')}",
-            "rising": f"↑ **Rising {rising_sign}**: {rising_interpretations.get(rising_sign, 'How others see you.')}"
-        }
+        return _interp_triplet(subject.sun.sign, subject.moon.sign, subject.first_house.sign)
 
 
-def get_timezone_suggestions(city: str = None) -> List[str]:
+def get_timezone_suggestions(city: str = None) -> Tuple[str, ...]:
     """Helper to suggest common timezones"""
-    common_timezones = [
-        "America/New_York",
-        "America/Chicago",
-        "America/Denver",
-        "America/Los_Angeles",
-        "America/Phoenix",
-        "America/Anchorage",
-        "Pacific/Honolulu",
-        "Europe/London",
-        "Europe/Paris",
-        "Europe/Berlin",
-        "Europe/Rome",
-        "Europe/Madrid",
-        "Europe/Lisbon",
-        "Asia/Tokyo",
-        "Asia/Shanghai",
-        "Asia/Hong_Kong",
-        "Asia/Singapore",
-        "Asia/Dubai",
-        "Asia/Kolkata",
-        "Australia/Sydney",
-        "Australia/Melbourne",
-        "Pacific/Auckland"
-    ]
-    return common_timezones
+    return _TIMEZONE_SUGGESTIONS
+
+
+def _warmup() -> None:
+    """Pay the Kerykeion / Swiss Ephemeris cold-start cost before the first user does"""
+    try:
+        # Greenwich, non-zero coordinates so Kerykeion never falls back to GeoNames
+        key = (2000, 1, 1, 12, 0, 51.478, -0.002, "Europe/London")
+        # Runs the aspect ranking too, so numba's JIT compile / cache load happens here
+        NatalChartGenerator()._get_aspects(_build_aspects(*key))
+        _render_chart_svg("Warmup", *key)
+    except Exception:
+        # A failed warmup only means the first real request is slower, but the
+        # same error (e.g. missing ephemeris files) will likely hit users too
+        logging.getLogger(__name__).warning("Chart warmup failed", exc_info=True)
+
+
+# Warm up in the background so importing this module never blocks.
+# Set NATAL_WARMUP=0 to skip it (e.g. in tests)
+if os.environ.get("NATAL_WARMUP", "1") == "1":
+    threading.Thread(target=_warmup, name="natal-warmup", daemon=True).start()
 
 
 if __name__ == "__main__":
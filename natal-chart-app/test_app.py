@@ -0,0 +1,236 @@
+"""
+Tests for the Gradio app's pure helpers (no Kerykeion or running server needed)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app
+from app import (
+    MAX_BATCH_ROWS,
+    _to_json,
+    _check_birth_ranges,
+    _parse_batch_row,
+    fill_city_coords,
+    format_interpretation,
+)
+
+
+ROW = {
+    "name": " Carl Jung ",
+    "date": "1875-07-26",
+    "hour": "19",
+    "minute": "20",
+    "latitude": "47.6",
+    "longitude": "9.32",
+    "timezone": "Europe/Zurich ",
+    "city": "Kesswil",
+}
+
+RESULT = {
+    "name": "Carl Jung",
+    "birth_data": {
+        "date": "1875-07-26",
+        "time": "19:20",
+        "location": "Kesswil",
+        "timezone": "Europe/Zurich"
+    },
+    "interpretation": {"sun": "SUN", "moon": "MOON", "rising": "RISING"},
+    "placements": {
+        "Sun": {"sign": "Leo", "position": 3.12, "house": 6, "retrograde": False},
+        "Saturn": {"sign": "Aquarius", "position": 27.5, "house": 12, "retrograde": True},
+    },
+    "aspects": [{"planets": f"Sun - P{i}", "type": "trine", "orb": i / 10} for i in range(7)],
+}
+
+# Output of the original += based format_interpretation for RESULT
+EXPECTED_HEADER = (
+    "\n# 🌟 Natal Chart for Carl Jung\n\n## Birth Information\n"
+    "📅 **Date**: 1875-07-26  \n🕐 **Time**: 19:20  \n"
+    "📍 **Location**: Kesswil  \n🌍 **Timezone**: Europe/Zurich\n\n---\n\n"
+    "## ✨ Your Core Identity (Big Three)\n\nSUN\n\nMOON\n\nRISING\n\n---\n\n"
+    "## 🪐 Planetary Placements\n\n"
+    "**Sun**: Leo at 3.12° (House 6)\n\n"
+    "**Saturn**: Aquarius at 27.5° (House 12) ℞\n\n"
+)
+EXPECTED_ASPECTS = (
+    "\n---\n\n## 🔗 Major Aspects\n\n"
+    "- Sun - P0: trine (orb 0.0°)\n"
+    "- Sun - P1: trine (orb 0.1°)\n"
+    "- Sun - P2: trine (orb 0.2°)\n"
+    "- Sun - P3: trine (orb 0.3°)\n"
+    "- Sun - P4: trine (orb 0.4°)\n"
+)
+
+CSV_HEADER = "name,date,hour,minute,latitude,longitude,timezone,city\n"
+CSV_ROW = "Carl Jung,1875-07-26,19,20,47.6,9.32,Europe/Zurich,Kesswil\n"
+
+
+class _FakeGenerator:
+    """Records the Batch Mode calls instead of computing charts"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_charts(self, batch, save_svgs=True):
+        self.calls.append((batch, save_svgs))
+        return [{"success": True, "name": chart["name"]} for chart in batch]
+
+
+@pytest.fixture
+def fake_generator(monkeypatch):
+    fake = _FakeGenerator()
+    monkeypatch.setattr(app, "generator", fake)
+    return fake
+
+
+def _run_batch(tmp_path, text, encoding="utf-8"):
+    csv_path = tmp_path / "batch.csv"
+    csv_path.write_text(text, encoding=encoding)
+    return json.loads(asyncio.run(app.generate_batch(str(csv_path))))
+
+
+def test_parse_batch_row():
+    assert _parse_batch_row(ROW) == {
+        "name": "Carl Jung",
+        "year": 1875,
+        "month": 7,
+        "day": 26,
+        "hour": 19,
+        "minute": 20,
+        "latitude": 47.6,
+        "longitude": 9.32,
+        "timezone": "Europe/Zurich",
+        "city": "Kesswil",
+    }
+
+
+def test_parse_batch_row_without_city():
+    row = {key: value for key, value in ROW.items() if key != "city"}
+    assert _parse_batch_row(row)["city"] is None
+    assert _parse_batch_row(dict(ROW, city="  "))["city"] is None
+
+
+@pytest.mark.parametrize("field, value", [
+    ("date", "1875-13-26"),
+    ("date", "26/07/1875"),
+    ("hour", "seven"),
+])
+def test_parse_batch_row_rejects_bad_values(field, value):
+    with pytest.raises(ValueError):
+        _parse_batch_row(dict(ROW, **{field: value}))
+
+
+def test_parse_batch_row_requires_columns():
+    row = {key: value for key, value in ROW.items() if key != "timezone"}
+    with pytest.raises(KeyError):
+        _parse_batch_row(row)
+
+
+def test_check_birth_ranges_accepts_limits():
+    assert _check_birth_ranges(90, -180, 0, 0) is None
+    assert _check_birth_ranges(-90, 180, 23, 59) is None
+
+
+@pytest.mark.parametrize("latitude, longitude, hour, minute, message", [
+    (90.5, 0, 12, 0, "Latitude"),
+    (None, 0, 12, 0, "Latitude"),
+    (0, -180.5, 12, 0, "Longitude"),
+    (0, None, 12, 0, "Longitude"),
+    (0, 0, 24, 0, "Birth time"),
+    (0, 0, 12, -1, "Birth time"),
+    (0, 0, None, 0, "Birth time"),
+    (0, 0, 12, None, "Birth time"),
+])
+def test_check_birth_ranges_rejects(latitude, longitude, hour, minute, message):
+    assert _check_birth_ranges(latitude, longitude, hour, minute).startswith(message)
+
+
+@pytest.mark.parametrize("field, value", [
+    ("latitude", "91"),
+    ("longitude", "-180.5"),
+    ("hour", "24"),
+    ("minute", "60"),
+])
+def test_parse_batch_row_rejects_out_of_range(field, value):
+    with pytest.raises(ValueError, match="^Carl Jung: "):
+        _parse_batch_row(dict(ROW, **{field: value}))
+
+
+def test_generate_batch_computes_chart_data_only(tmp_path, fake_generator):
+    results = _run_batch(tmp_path, CSV_HEADER + CSV_ROW * 2)
+
+    assert results == [{"success": True, "name": "Carl Jung"}] * 2
+    (batch, save_svgs), = fake_generator.calls
+    assert len(batch) == 2 and save_svgs is False
+
+
+def test_generate_batch_accepts_bom(tmp_path, fake_generator):
+    results = _run_batch(tmp_path, CSV_HEADER + CSV_ROW, encoding="utf-8-sig")
+
+    assert results == [{"success": True, "name": "Carl Jung"}]
+
+
+def test_generate_batch_caps_rows(tmp_path, fake_generator):
+    result = _run_batch(tmp_path, CSV_HEADER + CSV_ROW * (MAX_BATCH_ROWS + 1))
+
+    assert result["success"] is False
+    assert result["error"].startswith("Too many rows")
+    assert fake_generator.calls == []
+
+
+def test_generate_batch_accepts_rows_up_to_cap(tmp_path, fake_generator):
+    results = _run_batch(tmp_path, CSV_HEADER + CSV_ROW * MAX_BATCH_ROWS)
+
+    assert len(results) == MAX_BATCH_ROWS
+
+
+@pytest.mark.parametrize("text", [
+    # Short row: the missing columns come back as None
+    CSV_HEADER + "Carl Jung,1875-07-26\n",
+    # No timezone column
+    "name,date,hour,minute,latitude,longitude\n" + "Carl Jung,1875-07-26,19,20,47.6,9.32\n",
+    CSV_HEADER + "Carl Jung,1875-07-26,nineteen,20,47.6,9.32,Europe/Zurich,\n",
+])
+def test_generate_batch_reports_invalid_csv(tmp_path, fake_generator, text):
+    result = _run_batch(tmp_path, text)
+
+    assert result["success"] is False
+    assert result["error"].startswith("Invalid CSV")
+    assert fake_generator.calls == []
+
+
+def test_generate_batch_without_file():
+    assert asyncio.run(app.generate_batch(None)) == "❌ Please upload a CSV file."
+
+
+def test_fill_city_coords_known_city():
+    assert fill_city_coords("Tokyo, Japan") == (35.6762, 139.6503, "Asia/Tokyo", "Tokyo, Japan")
+
+
+@pytest.mark.parametrize("selection", ["Custom Location", "Atlantis", None])
+def test_fill_city_coords_fallback(selection):
+    assert fill_city_coords(selection) == (0.0, 0.0, "UTC", "")
+
+
+def test_format_interpretation_matches_original_output():
+    assert format_interpretation(RESULT) == EXPECTED_HEADER + EXPECTED_ASPECTS
+
+
+def test_format_interpretation_without_aspects():
+    assert format_interpretation(dict(RESULT, aspects=[])) == EXPECTED_HEADER
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_to_json_keeps_non_ascii(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(app, "orjson", None)
+
+    text = _to_json({"name": "Zoë", "error": "❌"})
+
+    assert "Zoë" in text and "❌" in text
+    assert json.loads(text) == {"name": "Zoë", "error": "❌"}
@@ -0,0 +1,179 @@
+"""
+Tests for the pure helpers in natal_backend (no Swiss Ephemeris needed)
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import natal_backend
+from natal_backend import NatalChartGenerator, _chart_hash, _top_aspects
+
+
+# The undecorated function, whether or not numba is installed
+_top_aspects_py = getattr(_top_aspects, "py_func", _top_aspects)
+
+ORBITS = np.array([3.2, -0.5, 1.1, 7.0, 0.2, -2.0, 4.4, 5.5, 6.6, 0.9, 8.8, 1.5])
+
+
+def test_top_aspects_orders_by_absolute_orb():
+    idx = _top_aspects(ORBITS, 10)
+
+    assert list(idx) == [4, 1, 9, 2, 11, 5, 0, 6, 7, 8]
+    # The two widest orbs (7.0 and 8.8) are dropped
+    assert 3 not in idx and 10 not in idx
+
+
+def test_top_aspects_with_fewer_orbs_than_requested():
+    assert list(_top_aspects(ORBITS[:3], 10)) == [1, 2, 0]
+    assert list(_top_aspects(ORBITS[:3], 3)) == [1, 2, 0]
+
+
+def test_top_aspects_empty():
+    assert len(_top_aspects(np.array([], dtype=np.float64), 10)) == 0
+
+
+def test_top_aspects_jit_matches_numpy():
+    numba = pytest.importorskip("numba")
+    jitted = numba.njit(_top_aspects_py)
+    rng = np.random.default_rng(42)
+
+    for size in (0, 3, 10, 11, 45, 300):
+        orbits = rng.uniform(-10, 10, size)
+        assert list(jitted(orbits, 10)) == list(_top_aspects_py(orbits, 10))
+
+
+def _aspect(p2_name, orbit, kind="trine"):
+    return {"p1_name": "Sun", "p2_name": p2_name, "aspect": kind, "orbit": orbit}
+
+
+def test_get_aspects_keeps_ten_tightest_in_orb_order():
+    aspects = SimpleNamespace(all_aspects=[_aspect(f"P{i}", orbit) for i, orbit in enumerate(ORBITS)])
+
+    result = NatalChartGenerator()._get_aspects(aspects)
+
+    assert [a["planets"] for a in result] == [
+        "Sun - P4", "Sun - P1", "Sun - P9", "Sun - P2", "Sun - P11",
+        "Sun - P5", "Sun - P0", "Sun - P6", "Sun - P7", "Sun - P8"
+    ]
+    assert result[0] == {"planets": "Sun - P4", "type": "trine", "orb": 0.2}
+    assert result[1]["orb"] == -0.5
+
+
+def test_get_aspects_rounds_orbs():
+    aspects = SimpleNamespace(all_aspects=[_aspect("Moon", 1.23456, "square")])
+
+    assert NatalChartGenerator()._get_aspects(aspects) == [
+        {"planets": "Sun - Moon", "type": "square", "orb": 1.23}
+    ]
+
+
+def test_get_aspects_without_aspect_list():
+    generator = NatalChartGenerator()
+
+    assert generator._get_aspects(SimpleNamespace()) == []
+    assert generator._get_aspects(SimpleNamespace(all_aspects=[])) == []
+
+
+def test_chart_hash_is_stable():
+    key = ("Carl Jung", 1875, 7, 26, 19, 20, 47.6, 9.32, "Europe/Zurich")
+
+    assert _chart_hash(*key) == "eeac13f672f0e694"
+    assert _chart_hash(*key) == _chart_hash(*key)
+
+
+def test_chart_hash_separates_fields():
+    base = ("Jane", 1990, 1, 11, 12, 0, 40.7, -74.0, "America/New_York")
+    swapped = ("Jane", 1990, 11, 1, 12, 0, 40.7, -74.0, "America/New_York")
+    renamed = ("jane", 1990, 1, 11, 12, 0, 40.7, -74.0, "America/New_York")
+
+    assert _chart_hash(*base) != _chart_hash(*swapped)
+    assert _chart_hash(*base) != _chart_hash(*renamed)
+
+
+def test_timezone_suggestions_are_shared_and_read_only():
+    assert natal_backend.get_timezone_suggestions() is natal_backend.get_timezone_suggestions()
+    assert isinstance(natal_backend.get_timezone_suggestions(), tuple)
+
+
+_SIGNS = ("Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis")
+
+
+def test_get_houses_in_order():
+    subject = SimpleNamespace(**{
+        attr: SimpleNamespace(sign=sign) for attr, sign in zip(natal_backend._HOUSE_ATTRS, _SIGNS)
+    })
+
+    houses = NatalChartGenerator()._get_houses(subject)
+
+    assert list(houses) == [f"House {i}" for i in range(1, 13)]
+    assert houses["House 1"] == "Ari"
+    assert houses["House 12"] == "Pis"
+
+
+def _fake_subject():
+    """Stand-in AstrologicalSubject with every planet and house _get_* reads"""
+    planets = {
+        name.lower(): SimpleNamespace(sign=sign, position=i + 0.456, house=i + 1, retrograde=i % 2 == 1)
+        for i, (name, sign) in enumerate(zip(natal_backend._PLANET_NAMES, _SIGNS))
+    }
+    houses = {attr: SimpleNamespace(sign=sign) for attr, sign in zip(natal_backend._HOUSE_ATTRS, _SIGNS)}
+    return SimpleNamespace(name="Cached", **planets, **houses)
+
+
+def test_get_placements_for_every_planet():
+    placements = NatalChartGenerator()._get_placements(_fake_subject())
+
+    assert list(placements) == list(natal_backend._PLANET_NAMES)
+    assert placements["Sun"] == {"sign": "Ari", "position": 0.46, "house": 1, "retrograde": False}
+    assert placements["Pluto"] == {"sign": "Cap", "position": 9.46, "house": 10, "retrograde": True}
+
+
+def test_save_svg_creates_output_dir_on_first_save(tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    monkeypatch.setattr(natal_backend, "_OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(natal_backend, "_output_dir_ready", False)
+    monkeypatch.setattr(natal_backend, "_render_chart_svg", lambda name, *key: f"<svg>{name}</svg>")
+    chart = ("Jane", 1990, 1, 11, 12, 0, 40.7, -74.0, "America/New_York")
+
+    path = NatalChartGenerator().save_svg(*chart)
+
+    assert output_dir.is_dir()
+    assert open(path, encoding="utf-8").read() == "<svg>Jane</svg>"
+    # The same chart reuses the saved file
+    assert NatalChartGenerator().save_svg(*chart) == path
+    assert [p.name for p in output_dir.iterdir()] == [f"{_chart_hash(*chart)}.svg"]
+
+
+def test_compute_chart_reads_the_cached_subject(monkeypatch):
+    subject = _fake_subject()
+    monkeypatch.setattr(natal_backend, "_build_subject", lambda *key: subject)
+    monkeypatch.setattr(natal_backend, "_build_aspects", lambda *key: SimpleNamespace(all_aspects=[]))
+
+    def _no_copy(name, key):
+        raise AssertionError("compute_chart should not copy the cached subject")
+
+    monkeypatch.setattr(natal_backend, "_named_subject", _no_copy)
+
+    chart = NatalChartGenerator().compute_chart("Jane", 1990, 1, 11, 12, 0, 40.7, -74.0, "America/New_York")
+
+    assert chart["success"] is True
+    assert chart["name"] == "Jane"
+    assert chart["houses"]["House 1"] == "Ari"
+    assert chart["interpretation"]["sun"].startswith("☉ **Sun in Ari**")
+    # The shared cached subject is never relabelled
+    assert subject.name == "Cached"
+
+
+def test_warmup_logs_failures(monkeypatch, caplog):
+    def _broken(*key):
+        raise RuntimeError("no ephemeris files")
+
+    monkeypatch.setattr(natal_backend, "_build_aspects", _broken)
+
+    natal_backend._warmup()
+
+    record, = caplog.records
+    assert record.levelname == "WARNING"
+    assert record.exc_info[1].args == ("no ephemeris files",)